@@ -4,11 +4,11 @@ Streamlit dashboard to compare QQQ, QQQ3.MI and a synthetic 3×-QQQ proxy.
 """
 from __future__ import annotations
 
+import io
 import logging
+import threading
 from datetime import date
-from functools import lru_cache
 
-import altair as alt
 import pandas as pd
 import streamlit as st
 import yfinance as yf
@@ -26,33 +26,63 @@ logging.basicConfig(
 
 TICKER_BASE = "QQQ"        # Nasdaq-100 ETF
 TICKER_LEV  = "QQQ3.MI"    # 3× leveraged Nasdaq-100 ETF (Borsa Italiana)
+TICKER_SYN  = "QQQ×3"      # synthetic 3× QQQ, derived at display time
+LEVERAGE    = 3
+
+# browser-side number formatting for the snapshot table (no Styler, no rounding)
+FLOAT_CFG = {
+    c: st.column_config.NumberColumn(format="%.2f")
+    for c in (TICKER_BASE, TICKER_LEV, TICKER_SYN)
+}
+
+# yf.download keeps its results in module-global state and is not thread-safe;
+# Streamlit runs each session in its own thread, so serialise the calls.
+_YF_LOCK = threading.Lock()
 
 # ──────────────────────────────────────────
 # Data helpers
 # ──────────────────────────────────────────
-@lru_cache(maxsize=8)
-def _download(symbol: str, start: str) -> pd.DataFrame:
-    """Return one tz-naive adjusted-price column named *symbol*."""
-    df = yf.download(symbol, start=start, auto_adjust=True, progress=False)
+@st.cache_data(ttl=60 * 60, max_entries=32, show_spinner=False)
+def _download_raw(symbols: tuple[str, ...], start: str) -> bytes:
+    """Adjusted prices for *symbols* as a Feather blob (one request, cached)."""
+    with _YF_LOCK:                                  # one batched call at a time
+        df = yf.download(
+            list(symbols), start=start, auto_adjust=True, progress=False,
+            threads=True, group_by="column",
+        )
 
-    col = "Adj Close" if "Adj Close" in df.columns else "Close"
-    if col not in df.columns:
-        raise ValueError(f"{symbol}: missing price column")
+    fields = df.columns.get_level_values(0)
+    col = "Adj Close" if "Adj Close" in fields else "Close"
+    if col not in fields:
+        raise ValueError(f"{', '.join(symbols)}: missing price column")
 
-    if df.index.tz is not None:                     # strip timezone → tz-naive
-        df.index = df.index.tz_convert(None)
+    prices = df[col]
+    missing = [s for s in symbols if s not in prices.columns]
+    if missing:
+        raise ValueError(f"{', '.join(missing)}: no data returned")
 
-    return df[[col]].rename(columns={col: symbol}).dropna()
+    # float32 is exact to the cent at these price levels and halves the payload
+    prices = prices[list(symbols)].astype("float32")
+    prices.rename_axis("Date", inplace=True)
 
+    buf = io.BytesIO()
+    prices.reset_index().to_feather(buf)
+    return buf.getvalue()
 
-def build_dataset(start: str) -> pd.DataFrame:
-    """QQQ, QQQ3.MI + synthetic «QQQ×3» merged on common dates."""
-    qqq  = _download(TICKER_BASE, start)
-    qqq3 = _download(TICKER_LEV,  start)
 
-    merged = pd.concat([qqq, qqq3], axis=1).dropna(how="all")
-    merged["QQQ×3"] = merged[TICKER_BASE] * 3
-    merged = merged.dropna()
+def _download(symbols: tuple[str, ...], start: str) -> pd.DataFrame:
+    """Return tz-naive adjusted prices, one column per symbol."""
+    df = pd.read_feather(io.BytesIO(_download_raw(symbols, start)))
+    df.set_index("Date", inplace=True)              # fresh frame: no aliasing
+    df.index = df.index.tz_localize(None)           # tz-naive; no-op if already
+    return df
+
+
+def build_dataset(start: str) -> pd.DataFrame:
+    """QQQ and QQQ3.MI merged on common dates (synthetic «QQQ×3» is not stored)."""
+    # one batched download; rows where either venue was closed are NaN
+    merged = _download((TICKER_BASE, TICKER_LEV), start)
+    merged = merged[merged.notna().to_numpy().all(axis=1)]   # one-pass NaN mask
 
     if merged.empty:
         raise ValueError("No overlapping data for the chosen start date.")
@@ -61,7 +91,10 @@ def build_dataset(start: str) -> pd.DataFrame:
 
 def normalise(df: pd.DataFrame) -> pd.DataFrame:
     """Re-base each column so the first value = 100."""
-    return df if df.empty else df.div(df.iloc[0]).mul(100)
+    if df.empty:
+        return df
+    arr = df.to_numpy(copy=False)                   # one fused broadcast multiply
+    return pd.DataFrame(arr * (100.0 / arr[0]), index=df.index, columns=df.columns)
 
 # ──────────────────────────────────────────
 # Streamlit UI
@@ -76,6 +109,7 @@ def main() -> None:
         max_value=date.today(),
     )
     view = st.sidebar.radio("Display mode", ("Raw price", "Normalised (start = 100)"))
+    show_chart = st.sidebar.toggle("Show chart", value=True, key="show_chart")
 
     # --- data -----------------------------------------------------------------
     try:
@@ -84,37 +118,25 @@ def main() -> None:
         st.error(str(e))
         st.stop()
 
-    df_plot = normalise(data) if "Normalised" in view else data
-    y_label = "Indexed level (start = 100)" if "Normalised" in view else "Price"
-
-    # --- Altair chart (robust column naming) ----------------------------------
-    temp = (
-        df_plot
-        .reset_index()                                        # index → column
-        .rename(columns={df_plot.index.name or "index": "Date"})  # ensure Date
-    )
-    chart_df = temp.melt(id_vars="Date", var_name="Ticker", value_name="Price")
-
-    chart = (
-        alt.Chart(chart_df)
-        .mark_line()
-        .encode(
-            x="Date:T",
-            y=alt.Y("Price:Q", title=y_label),
-            color="Ticker:N",
-            tooltip=["Date:T", "Ticker:N", alt.Tooltip("Price:Q", format=".2f")],
-        )
-        .properties(height=450)
-        .interactive()
-    )
+    # Re-basing cancels the 3× factor (QQQ×3 ≡ QQQ), so the synthetic series is
+    # only drawn in Raw mode.
+    normalised = "Normalised" in view
+    if normalised:
+        df_plot = normalise(data)
+    else:
+        df_plot = data.assign(**{TICKER_SYN: data[TICKER_BASE] * LEVERAGE})
+    y_label = "Indexed level (start = 100)" if normalised else "Price"
 
-    st.altair_chart(chart, use_container_width=True)
+    # --- chart (wide data straight to Streamlit; skipped when hidden) --------
+    if show_chart:
+        st.line_chart(df_plot, height=450, y_label=y_label)
 
     # --- latest rows ----------------------------------------------------------
     st.subheader("Latest snapshot")
-    st.dataframe(df_plot.tail(3).style.format("{:.2f}"), use_container_width=True)
+    st.dataframe(df_plot.tail(3), column_config=FLOAT_CFG, use_container_width=True)
     st.caption(
-        "**QQQ×3** is a simple 3× multiple of QQQ (ignores daily compounding); "
+        "**QQQ×3** is a simple 3× multiple of QQQ (ignores daily compounding) and "
+        "coincides with QQQ once normalised; "
         "**QQQ3.MI** is the actual 3× ETF listed on Borsa Italiana."
     )
 